@@ -1,11 +1,12 @@
 """
 Scheduler Agent - Orchestrates the entire agentic workflow using LangGraph StateGraph
-Triggers every 10 minutes and coordinates all other agents
+Triggers every 60 seconds (CHECK_INTERVAL_SECONDS in main.py) and coordinates all other agents
 """
 
 import asyncio
 import logging
-from typing import Dict, Any, List, TypedDict
+import time
+from typing import Dict, Any, List, Optional, TypedDict
 from datetime import datetime, timedelta
 from langgraph.graph import StateGraph, END
 
@@ -40,6 +41,13 @@ class SchedulerAgent:
         self.config = config
         self.last_check_time = datetime.now() - timedelta(minutes=1)
         
+        # Wall-clock time of the next periodic run, for health reporting
+        self.next_run_time: Optional[datetime] = None
+        self._next_run_monotonic = 0.0
+        
+        # Serializes workflow runs so manual and periodic triggers never overlap
+        self._tick_lock = asyncio.Lock()
+        
         # Initialize all agents
         self.mail_fetcher = MailFetcherAgent(config)
         self.classifier = ClassifierAgent(config)
@@ -98,23 +106,24 @@ class SchedulerAgent:
             logger.info(f"Classified {len(support_emails)} emails as support-related")
             return state
         
-        def process_support_emails(state: WorkflowState) -> WorkflowState:
+        async def process_support_emails(state: WorkflowState) -> WorkflowState:
             """Node: Process each support email to create tickets"""
             if state.get("error") or not state.get("support_emails"):
                 return state
             
+            pending_tickets = []
             processed_tickets = []
             
             for email in state["support_emails"]:
                 try:
                     # Generate summary using original email
-                    summary_result = self.summary.generate_summary(email)
+                    summary_result = await asyncio.to_thread(self.summary.generate_summary, email)
                     
                     # Extract category using original email
-                    category_result = self.category_extractor.extract_category(email)
+                    category_result = await asyncio.to_thread(self.category_extractor.extract_category, email)
                     
-                    # Create ServiceNow ticket
-                    ticket_data = {
+                    # Prepare ServiceNow ticket
+                    pending_tickets.append({
                         "email": email,
                         "summary": summary_result,
                         "category": category_result,
@@ -124,10 +133,25 @@ class SchedulerAgent:
                         "category_name": category_result.get("category", "General"),
                         "priority": category_result.get("priority", "3"),
                         "urgency": category_result.get("urgency", "3")
-                    }
+                    })
                     
-                    # Create ticket in ServiceNow
-                    ticket_result = self.servicenow.create_incident(ticket_data)
+                except Exception as e:
+                    logger.error(f"Error processing email: {e}")
+                    continue
+            
+            # Resolve all senders and categories up front so per-ticket lookups hit the cache
+            await self.servicenow.aprewarm_caches(
+                [ticket["caller_email"] for ticket in pending_tickets],
+                [ticket["category_name"] for ticket in pending_tickets]
+            )
+            
+            # Create tickets in ServiceNow concurrently (bounded by servicenow_concurrency)
+            ticket_results = await self.servicenow.acreate_incidents(pending_tickets)
+            
+            for ticket_data, ticket_result in zip(pending_tickets, ticket_results):
+                try:
+                    if isinstance(ticket_result, Exception):
+                        raise ticket_result
                     
                     if ticket_result.get("success"):
                         ticket_data["ticket_number"] = ticket_result.get("ticket_number")
@@ -135,13 +159,14 @@ class SchedulerAgent:
                         processed_tickets.append(ticket_data)
                         
                         # Send confirmation email
-                        self.notification.send_confirmation_email(
-                            email.get("from", ""),
+                        await asyncio.to_thread(
+                            self.notification.send_confirmation_email,
+                            ticket_data["caller_email"],
                             ticket_result.get("ticket_number"),
-                            summary_result.get("short_description", "")
+                            ticket_data["summary"].get("short_description", "")
                         )
                         
-                        logger.info(f"Created ticket {ticket_result.get('ticket_number')} for email from {email.get('from', '')}")
+                        logger.info(f"Created ticket {ticket_result.get('ticket_number')} for email from {ticket_data['caller_email']}")
                     
                 except Exception as e:
                     logger.error(f"Error processing email: {e}")
@@ -190,6 +215,14 @@ class SchedulerAgent:
     
     async def trigger_workflow(self):
         """Trigger the complete agentic workflow"""
+        if self._tick_lock.locked():
+            logger.info("Workflow already running - waiting for it to finish")
+        
+        async with self._tick_lock:
+            await self._run_workflow()
+    
+    async def _run_workflow(self):
+        """Run the workflow once; callers must hold _tick_lock"""
         try:
             logger.info("Starting agentic workflow...")
             start_time = datetime.now()
@@ -226,6 +259,23 @@ class SchedulerAgent:
             logger.error(f"Workflow execution failed: {e}")
             raise
     
+    async def run_periodically(self, interval_s: float):
+        """Run the workflow immediately and then every interval_s seconds until cancelled"""
+        self._next_run_monotonic = time.monotonic()
+        
+        while True:
+            delay = max(0.0, self._next_run_monotonic - time.monotonic())
+            self.next_run_time = datetime.now() + timedelta(seconds=delay)
+            await asyncio.sleep(delay)
+            
+            try:
+                await self.trigger_workflow()
+            except Exception as e:
+                logger.error(f"Scheduled workflow run failed: {e}")
+            
+            # Skip missed slots rather than running back-to-back after a slow run
+            self._next_run_monotonic = max(self._next_run_monotonic + interval_s, time.monotonic())
+    
     async def trigger_tracker_check(self):
         """Trigger ticket tracking check for existing tickets"""
         try:
@@ -233,4 +283,14 @@ class SchedulerAgent:
             await self.tracker.check_all_tracked_tickets()
             logger.info("----------------------------flow completed----------------------------")
         except Exception as e:
-            logger.error(f"Tracker check failed: {e}")
\ No newline at end of file
+            logger.error(f"Tracker check failed: {e}")
+    
+    async def aclear_caches(self):
+        """Invalidate the ServiceNow lookup caches held by the agents"""
+        await self.servicenow.aclear_caches()
+        await self.tracker.servicenow_agent.aclear_caches()
+    
+    async def aclose(self):
+        """Close the ServiceNow connection pools held by the agents"""
+        await self.servicenow.aclose()
+        await self.tracker.aclose()
@@ -4,61 +4,179 @@ Handles dynamic user/group lookups with fallback to config defaults
 """
 
 import logging
+import asyncio
 from typing import Dict, Any, Optional, List
 import httpx
 import json
+import os
+import threading
+import time
 from datetime import datetime
+from types import MappingProxyType
 import random
+import diskcache
+from cachetools import TLRUCache, TTLCache, cachedmethod
 
-from tools.servicenow_api import ServiceNowAPI
+from tools.servicenow_api import ServiceNowAPI, MAX_CONCURRENT_REQUESTS, create_client, create_async_client
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Default internal category to ServiceNow category values (read-only)
+_DEFAULT_CATEGORY_MAP = MappingProxyType({
+    "IT": "Software",
+    "HR": "Human Resources",
+    "Finance": "Finance",
+    "Facilities": "Facilities",
+    "General": "General"
+})
+
+# ServiceNow incident field length limit
+_SHORT_DESC_MAX = 160
+
+def _truncate(value: str, limit: int) -> str:
+    """Cap a string at limit characters, returning it untouched when already short"""
+    return value if len(value) <= limit else value[:limit]
+
+# ServiceNow incident state written when closing
+_CLOSE_STATE = "6"
+
+def _close_timestamp() -> str:
+    """Current time in the format ServiceNow expects for closed_at/resolved_at"""
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+def _build_close_data(resolution_code: str, resolution_notes: str, now_str: str) -> Dict[str, Any]:
+    """Build the update payload that closes an incident"""
+    # Closed and resolved share one timestamp
+    return {
+        "state": _CLOSE_STATE,
+        "resolution_code": resolution_code,
+        "resolution_notes": resolution_notes,
+        "closed_at": now_str,
+        "resolved_at": now_str
+    }
+
+# Incident description layout; optional sections are filled from the templates below
+_DESC_TMPL = (
+    "{issue}"
+    "Email Details:\n"
+    "From: {sender}\n"
+    "Subject: {subject}\n"
+    "Date: {date}"
+    "{preview}"
+    "{categorization}"
+    "\n\nAuto-generated: {generated}"
+)
+_DESC_ISSUE_TMPL = "Issue Description:\n{description}\n\n"
+_DESC_PREVIEW_TMPL = "\n\nEmail Preview:\n{preview}"
+_DESC_CATEGORY_TMPL = "\n\nCategorization:\nCategory: {category}\nReasoning: {reasoning}"
+
+# Lookup cache lifetimes in seconds
+USER_CACHE_TTL = 600
+GROUP_CACHE_TTL = 3600
+
+# Lifetime of cached "not found" lookups, kept short so new records show up soon
+NEGATIVE_CACHE_TTL = 300
+
+# How long a caller's ETag outlives its entry, for conditional refreshes
+ETAG_CACHE_TTL = 7 * 24 * 3600
+
+# On-disk size cap for the persistent lookup cache
+CACHE_SIZE_LIMIT = 50 * 1024 * 1024
+
+# Number of lookup entries held in memory in front of the on-disk cache
+CACHE_MEMORY_MAXSIZE = 4096
+
+def _ck(kind: str, key: str) -> tuple:
+    """Namespaced key for the shared lookup cache, e.g. ("caller", email)"""
+    return (kind, key)
+
+def _entry_expiry(_key, entry: tuple, _now: float) -> float:
+    """TLRUCache ttu: in-memory entries are (value, absolute expiry time)"""
+    return entry[1]
+
 class ServiceNowAgent:
     """Agent responsible for creating and managing ServiceNow incidents"""
     
     def __init__(self, config):
         self.config = config
         
+        # Long-lived pooled clients shared by all ServiceNow calls
+        self.client = create_client()
+        self.async_client = create_async_client()
+        
         # Initialize ServiceNow API helper
-        self.servicenow_api = ServiceNowAPI(config)
+        self.servicenow_api = ServiceNowAPI(config, client=self.client, async_client=self.async_client)
+        
+        # TTL cache shared by all user and group lookups; entries are namespaced by kind
+        # (see _ck) and expire individually. Reads are served from memory so the event
+        # loop never waits on SQLite - the on-disk copy only makes restarts start warm.
+        cache_dir = config.get_setting("cache_dir", "cache")
+        self._disk_cache = diskcache.Cache(os.path.join(cache_dir, "lookups"), size_limit=CACHE_SIZE_LIMIT)
+        self._cache = TLRUCache(maxsize=CACHE_MEMORY_MAXSIZE, ttu=_entry_expiry, timer=time.time)
+        
+        # Orders disk writes against clears: a write queued before a clear is
+        # dropped if it reaches the disk after the clear's generation bump
+        self._disk_lock = threading.Lock()
+        self._cache_generation = 0
+        self._load_disk_cache()
         
-        # Cache for user and group lookups
-        self._user_cache = {}
-        self._group_cache = {}
-        self._category_cache = {}
-        self._group_members_cache = {}
+        # Short-lived cache so repeated health probes don't ping ServiceNow each time
+        self._connection_status_cache = TTLCache(maxsize=1, ttl=30)
+        self._cache_lock = threading.Lock()
         
         # Get fallback assignments from config
         self.fallback_config = config.get_setting("servicenow_fallbacks", {})
+        
+        # Bounds concurrent incident operations; ServiceNowAPI caps in-flight HTTP requests
+        # (lookups and prewarm included) with the same setting to respect rate limits
+        self._sem = asyncio.Semaphore(config.get_setting("servicenow_concurrency", MAX_CONCURRENT_REQUESTS))
+        
+        # In-flight caller resolutions by (event loop, email), so concurrent tickets from
+        # one sender share a single lookup (and never create the same user twice)
+        self._caller_inflight: Dict[tuple, asyncio.Future] = {}
+        
+        # Category mappings resolved once rather than per incident
+        self._category_map = config.get_setting("servicenow_category_mapping", {})
+        self._group_mappings = config.get_setting("category_to_group", {})
+        self._user_mappings = config.get_setting("category_to_user", {})
     
     def create_incident(self, ticket_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create an incident in ServiceNow (synchronous façade over acreate_incident)"""
+        return asyncio.run(self._arun_scoped(self.acreate_incident(ticket_data)))
+    
+    async def _arun_scoped(self, coro):
+        """Await coro on a temporary AsyncClient scoped to this short-lived loop"""
+        async with self.servicenow_api.scoped_async_client():
+            return await coro
+    
+    async def acreate_incident(self, ticket_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create an incident in ServiceNow with improved assignment logic"""
         try:
             email_data = ticket_data.get("email", {})
             summary_data = ticket_data.get("summary", {})
             category_data = ticket_data.get("category", {})
+            category = category_data.get("category", "General")
             
-            logger.info(f"Creating ServiceNow incident for {email_data.get('from', 'unknown')}")
+            logger.info("Creating ServiceNow incident for %s", email_data.get('from', 'unknown'))
             
-            # Lookup caller information
-            caller_info = self._lookup_caller(email_data.get("from", ""))
-            logger.info(f"Caller lookup result: {caller_info}")
+            # Lookup caller, assignment group and category user concurrently
+            caller_info, assignment_group, assigned_user = await asyncio.gather(
+                self._alookup_caller(email_data.get("from", "")),
+                self._alookup_assignment_group(category),
+                self._alookup_assigned_user(category)
+            )
+            logger.info("Caller lookup result: %s", caller_info)
+            logger.info("Assignment group lookup result: %s", assignment_group)
             
-            # Lookup assignment group
-            assignment_group = self._lookup_assignment_group(category_data.get("category", "General"))
-            logger.info(f"Assignment group lookup result: {assignment_group}")
-            
-            # Lookup assigned user from the group
-            assigned_user = {"sys_id": "", "name": ""}
-            if assignment_group.get("sys_id"):
-                assigned_user = self._get_user_from_assignment_group(assignment_group.get("sys_id"))
-                logger.info(f"Assigned user lookup result: {assigned_user}")
+            # Fall back to a user from the assignment group
+            if not assigned_user.get("sys_id") and assignment_group.get("sys_id"):
+                assigned_user = await self._aget_user_from_assignment_group(assignment_group.get("sys_id"))
+            logger.info("Assigned user lookup result: %s", assigned_user)
             
             # Prepare incident data with validation
             incident_data = {
-                "short_description": ticket_data.get("short_description", "Support Request")[:160],
+                "short_description": _truncate(ticket_data.get("short_description", "Support Request"), _SHORT_DESC_MAX),
                 "description": self._build_incident_description(ticket_data),
                 "contact_type": "email",
                 "priority": str(category_data.get("priority", 3)),
@@ -78,15 +196,16 @@ class ServiceNowAgent:
             if assigned_user.get("sys_id"):
                 incident_data["assigned_to"] = assigned_user["sys_id"]
             
-            logger.info(f"Final incident data: {json.dumps(incident_data, indent=2)}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Final incident data: %s", json.dumps(incident_data, indent=2))
             
             # Create incident via API
-            result = self.servicenow_api.create_incident(incident_data)
+            result = await self.servicenow_api.acreate_incident(incident_data)
             
             if result.get("success"):
-                logger.info(f"Successfully created incident: {result.get('ticket_number')}")
-                logger.info(f"Assigned to group: {assignment_group.get('name', 'None')}")
-                logger.info(f"Assigned to user: {assigned_user.get('name', 'None')}")
+                logger.info("Successfully created incident: %s", result.get('ticket_number'))
+                logger.info("Assigned to group: %s", assignment_group.get('name', 'None'))
+                logger.info("Assigned to user: %s", assigned_user.get('name', 'None'))
                 
                 return {
                     "success": True,
@@ -98,19 +217,36 @@ class ServiceNowAgent:
                 }
             else:
                 error_msg = result.get("error", "Unknown error")
-                logger.error(f"Failed to create incident: {error_msg}")
+                logger.error("Failed to create incident: %s", error_msg)
                 return {
                     "success": False,
                     "error": error_msg
                 }
                 
         except Exception as e:
-            logger.error(f"Error creating ServiceNow incident: {e}")
+            logger.error("Error creating ServiceNow incident: %s", e)
             return {
                 "success": False,
                 "error": str(e)
             }
-    def _get_user_from_assignment_group(self, group_sys_id: str) -> Dict[str, Any]:
+    async def _bounded(self, coro):
+        """Await coro while holding the concurrency semaphore"""
+        async with self._sem:
+            return await coro
+    
+    async def acreate_incidents(self, tickets: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Create many incidents concurrently, at most servicenow_concurrency at a time
+        
+        Returns one result per ticket, in order; a failure is returned as its
+        exception rather than aborting the rest of the batch.
+        """
+        return await asyncio.gather(
+            *(self._bounded(self.acreate_incident(ticket)) for ticket in tickets),
+            return_exceptions=True
+        )
+    
+    async def _aget_user_from_assignment_group(self, group_sys_id: str) -> Dict[str, Any]:
         """Get a user from the assignment group for ticket assignment"""
         if not group_sys_id:
             logger.warning("No group sys_id provided")
@@ -118,38 +254,37 @@ class ServiceNowAgent:
         
         try:
             # Check cache first
-            cache_key = f"group_members_{group_sys_id}"
-            if cache_key in self._group_members_cache:
-                members = self._group_members_cache[cache_key]
-                logger.info(f"Using cached members for group {group_sys_id}: {len(members)} members")
+            members = self._cache_get("members", group_sys_id)
+            if members is not None:
+                logger.info("Using cached members for group %s: %s members", group_sys_id, len(members))
             else:
                 # Get group members from ServiceNow
-                members_result = self.servicenow_api.get_group_members(group_sys_id)
-                logger.info(f"Group members API result: {members_result}")
+                members_result = await self.servicenow_api.aget_group_members(group_sys_id)
+                logger.info("Group members API result: %s", members_result)
                 
                 if members_result.get("success") and members_result.get("members"):
                     members = members_result["members"]
-                    self._group_members_cache[cache_key] = members
-                    logger.info(f"Found {len(members)} members in group {group_sys_id}")
+                    await self._acache_set("members", group_sys_id, members, GROUP_CACHE_TTL)
+                    logger.info("Found %s members in group %s", len(members), group_sys_id)
                 else:
-                    logger.warning(f"No members found for group {group_sys_id}")
+                    logger.warning("No members found for group %s", group_sys_id)
                     return {"sys_id": "", "name": ""}
             
             # Select a random user from the group for load balancing
             if members:
                 selected_user = random.choice(members)
-                logger.info(f"Selected user {selected_user.get('name')} from group")
+                logger.info("Selected user %s from group", selected_user.get('name'))
                 return {
                     "sys_id": selected_user.get("sys_id", ""),
                     "name": selected_user.get("name", ""),
                     "email": selected_user.get("email", "")
                 }
             else:
-                logger.warning(f"No active members in group {group_sys_id}")
+                logger.warning("No active members in group %s", group_sys_id)
                 return {"sys_id": "", "name": ""}
                 
         except Exception as e:
-            logger.error(f"Error getting user from assignment group {group_sys_id}: {e}")
+            logger.error("Error getting user from assignment group %s: %s", group_sys_id, e)
             return {"sys_id": "", "name": ""}
 
     def _build_incident_description(self, ticket_data: Dict[str, Any]) -> str:
@@ -158,71 +293,168 @@ class ServiceNowAgent:
         summary_data = ticket_data.get("summary", {})
         category_data = ticket_data.get("category", {})
         
-        description_parts = []
+        # Optional sections render to empty strings when their data is missing
+        description = summary_data.get("description")
+        body_preview = email_data.get("body_preview")
+        reasoning = category_data.get("reasoning")
         
-        # Add summary description
-        if summary_data.get("description"):
-            description_parts.append("Issue Description:")
-            description_parts.append(summary_data["description"])
-            description_parts.append("")
-        
-        # Add email details
-        description_parts.append("Email Details:")
-        description_parts.append(f"From: {email_data.get('from', 'Unknown')}")
-        description_parts.append(f"Subject: {email_data.get('subject', 'No Subject')}")
-        description_parts.append(f"Date: {email_data.get('date', 'Unknown')}")
-        
-        # Add body preview if available
-        if email_data.get("body_preview"):
-            description_parts.append("")
-            description_parts.append("Email Preview:")
-            description_parts.append(email_data["body_preview"])
-        
-        # Add categorization info
-        if category_data.get("reasoning"):
-            description_parts.append("")
-            description_parts.append("Categorization:")
-            description_parts.append(f"Category: {category_data.get('category', 'General')}")
-            description_parts.append(f"Reasoning: {category_data.get('reasoning', '')}")
-        
-        # Add timestamp
-        description_parts.append("")
-        description_parts.append(f"Auto-generated: {datetime.now().isoformat()}")
-        
-        return "\n".join(description_parts)
+        return _DESC_TMPL.format(
+            issue=_DESC_ISSUE_TMPL.format(description=description) if description else "",
+            sender=email_data.get("from", "Unknown"),
+            subject=email_data.get("subject", "No Subject"),
+            date=email_data.get("date", "Unknown"),
+            preview=_DESC_PREVIEW_TMPL.format(preview=body_preview) if body_preview else "",
+            categorization=_DESC_CATEGORY_TMPL.format(
+                category=category_data.get("category", "General"),
+                reasoning=reasoning
+            ) if reasoning else "",
+            generated=datetime.now().isoformat()
+        )
+    
+    async def aprewarm_caches(self, emails: List[str], categories: Optional[List[str]] = None):
+        """Bulk-populate the lookup caches ahead of a batch of incident creations"""
+        try:
+            # Callers: one batched IN-query for every sender not already cached. Senders
+            # with a stored ETag are left to _alookup_caller, which revalidates them with
+            # a conditional GET instead of re-downloading the record
+            pending = [
+                email for email in dict.fromkeys(emails)
+                if email and self._cache_get("caller", email) is None
+                and self._cache_get("caller_etag", email) is None
+            ]
+            if pending:
+                users = await self.servicenow_api.alookup_users_by_emails(pending)
+                missing = []
+                for email, user in users.items():
+                    if not user.get("found"):
+                        missing.append(email)
+                        continue
+                    await self._acache_set("caller", email, {
+                        "sys_id": user.get("sys_id"),
+                        "name": user.get("name"),
+                        "email": email
+                    }, USER_CACHE_TTL)
+                logger.info("Prewarmed %s of %s uncached callers", len(users) - len(missing), len(pending))
+                
+                # The batch already showed these senders are unknown - create or
+                # negative-cache them now instead of re-querying each one per ticket
+                await asyncio.gather(*(self._ahandle_unknown_caller(email) for email in missing))
+            
+            # Groups and category users: one lookup per distinct category
+            unique_categories = list(dict.fromkeys(categories or []))
+            await asyncio.gather(
+                *(self._alookup_assignment_group(category) for category in unique_categories),
+                *(self._alookup_assigned_user(category) for category in unique_categories)
+            )
+            
+        except Exception as e:
+            logger.error("Error prewarming lookup caches: %s", e)
+    
+    def _load_disk_cache(self):
+        """Seed the in-memory lookup cache with the unexpired on-disk entries"""
+        try:
+            for cache_key in self._disk_cache.iterkeys():
+                value, expire_time = self._disk_cache.get(cache_key, expire_time=True)
+                if value is not None and expire_time is not None:
+                    self._cache[cache_key] = (value, expire_time)
+        except Exception as e:
+            logger.warning("Could not load lookup cache from disk: %s", e)
     
-    def _lookup_caller(self, email_address: str) -> Dict[str, Any]:
+    def _cache_get(self, kind: str, key: str) -> Optional[Any]:
+        """Read a lookup cache entry from memory"""
+        entry = self._cache.get(_ck(kind, key))
+        return entry[0] if entry is not None else None
+    
+    async def _acache_set(self, kind: str, key: str, value: Any, ttl: int):
+        """Write a lookup cache entry with an expiry of ttl seconds, persisting it off the event loop"""
+        cache_key = _ck(kind, key)
+        self._cache[cache_key] = (value, time.time() + ttl)
+        try:
+            await asyncio.to_thread(self._persist_entry, cache_key, value, ttl, self._cache_generation)
+        except Exception as e:
+            logger.warning("Could not persist lookup cache entry %s: %s", cache_key, e)
+    
+    def _persist_entry(self, cache_key: tuple, value: Any, ttl: int, generation: int):
+        """Write an entry to disk (worker thread) unless the caches were cleared since it was set"""
+        with self._disk_lock:
+            if generation == self._cache_generation:
+                self._disk_cache.set(cache_key, value, expire=ttl)
+    
+    def _clear_disk_cache(self):
+        """Clear the on-disk cache (worker thread), after any write already holding the lock"""
+        with self._disk_lock:
+            self._disk_cache.clear()
+    
+    async def aclear_caches(self):
+        """Invalidate every user and group lookup cache entry"""
+        self._cache.clear()
+        self._cache_generation += 1
+        self._connection_status_cache.clear()
+        await asyncio.to_thread(self._clear_disk_cache)
+        logger.info("Cleared ServiceNow lookup caches")
+    
+    async def _alookup_caller(self, email_address: str) -> Dict[str, Any]:
         """Lookup caller information by email address"""
         if not email_address:
             return self._get_fallback_caller()
         
-        # Check cache first
-        if email_address in self._user_cache:
-            return self._user_cache[email_address]
+        # Check cache first (including remembered misses)
+        cached = self._cache_get("caller", email_address)
+        if cached is not None:
+            return self._get_fallback_caller() if cached.get("_negative") else cached
         
+        # Join a resolution already running for this sender rather than starting another
+        # (keyed per loop: a sync façade call on its own loop can't await another loop's task)
+        inflight_key = (asyncio.get_running_loop(), email_address)
+        task = self._caller_inflight.get(inflight_key)
+        if task is None:
+            task = asyncio.ensure_future(self._aresolve_caller(email_address))
+            self._caller_inflight[inflight_key] = task
+            task.add_done_callback(lambda _: self._caller_inflight.pop(inflight_key, None))
+        
+        # Shielded so one cancelled ticket doesn't cancel the lookup for the others
+        return await asyncio.shield(task)
+    
+    async def _aresolve_caller(self, email_address: str) -> Dict[str, Any]:
+        """Resolve an uncached caller in ServiceNow, creating or falling back if unknown"""
         try:
-            # Lookup user in ServiceNow
-            user_result = self.servicenow_api.lookup_user_by_email(email_address)
+            # Lookup user in ServiceNow, revalidating the last fetched record if we have its ETag
+            validator = self._cache_get("caller_etag", email_address)
+            user_result = await self.servicenow_api.alookup_user_by_email(
+                email_address, etag=validator["etag"] if validator else None
+            )
             
-            if user_result.get("found"):
+            if user_result.get("not_modified") and validator:
+                # Unchanged since the last fetch - extend the TTL without replacing the value
+                await self._acache_set("caller", email_address, validator["value"], USER_CACHE_TTL)
+                logger.debug("Caller %s not modified", email_address)
+                return validator["value"]
+            elif user_result.get("found"):
                 caller_info = {
                     "sys_id": user_result.get("sys_id"),
                     "name": user_result.get("name"),
                     "email": email_address
                 }
                 # Cache result
-                self._user_cache[email_address] = caller_info
-                logger.debug(f"Found caller: {caller_info['name']}")
+                await self._acache_set("caller", email_address, caller_info, USER_CACHE_TTL)
+                if user_result.get("etag"):
+                    await self._acache_set("caller_etag", email_address,
+                                          {"etag": user_result["etag"], "value": caller_info}, ETAG_CACHE_TTL)
+                logger.debug("Found caller: %s", caller_info['name'])
                 return caller_info
+            elif user_result.get("error"):
+                # Lookup failed rather than missed - don't remember it
+                logger.error("Error looking up caller %s: %s", email_address, user_result['error'])
+                return self._get_fallback_caller()
             else:
                 # Create new user or use fallback
-                return self._handle_unknown_caller(email_address)
+                return await self._ahandle_unknown_caller(email_address)
                 
         except Exception as e:
-            logger.error(f"Error looking up caller {email_address}: {e}")
+            logger.error("Error looking up caller %s: %s", email_address, e)
             return self._get_fallback_caller()
     
-    def _handle_unknown_caller(self, email_address: str) -> Dict[str, Any]:
+    async def _ahandle_unknown_caller(self, email_address: str) -> Dict[str, Any]:
         """Handle unknown caller - create user or use fallback"""
         try:
             # Try to create new user
@@ -235,22 +467,30 @@ class ServiceNowAgent:
                     "active": True
                 }
                 
-                result = self.servicenow_api.create_user(user_data)
+                result = await self.servicenow_api.acreate_user(user_data)
                 if result.get("success"):
                     caller_info = {
                         "sys_id": result.get("sys_id"),
                         "name": result.get("name"),
                         "email": email_address
                     }
-                    self._user_cache[email_address] = caller_info
-                    logger.info(f"Created new user: {email_address}")
+                    await self._acache_set("caller", email_address, caller_info, USER_CACHE_TTL)
+                    logger.info("Created new user: %s", email_address)
                     return caller_info
             
+            # Remember the miss so repeat senders don't re-hit ServiceNow
+            await self._acache_set("caller", email_address, {
+                "sys_id": "",
+                "name": "Unknown Caller",
+                "email": email_address,
+                "_negative": True
+            }, NEGATIVE_CACHE_TTL)
+            
             # Fallback to default caller
             return self._get_fallback_caller()
             
         except Exception as e:
-            logger.error(f"Error handling unknown caller: {e}")
+            logger.error("Error handling unknown caller: %s", e)
             return self._get_fallback_caller()
     
     def _get_fallback_caller(self) -> Dict[str, Any]:
@@ -271,51 +511,53 @@ class ServiceNowAgent:
             "email": fallback_user.get("email", "default@company.com")
         }
     
-    def _lookup_assignment_group(self, category: str) -> Dict[str, Any]:
+    async def _alookup_assignment_group(self, category: str) -> Dict[str, Any]:
         """Lookup assignment group based on category"""
-        cache_key = f"group_{category}"
-        
-        # Check cache
-        if cache_key in self._group_cache:
-            return self._group_cache[cache_key]
+        # Check cache (including remembered misses)
+        cached = self._cache_get("group", category)
+        if cached is not None:
+            return self._get_fallback_group() if cached.get("_negative") else cached
         
         try:
             # Get group mapping from config
-            group_mappings = self.config.get_setting("category_to_group", {})
-            mapped_group = group_mappings.get(category)
+            mapped_group = self._group_mappings.get(category)
             
             if mapped_group:
                 # Lookup group in ServiceNow
-                result = self.servicenow_api.lookup_group_by_name(mapped_group)
+                result = await self.servicenow_api.alookup_group_by_name(mapped_group)
                 
                 if result.get("found"):
                     group_info = {
                         "sys_id": result.get("sys_id"),
                         "name": result.get("name")
                     }
-                    self._group_cache[cache_key] = group_info
-                    logger.info(f"Found assignment group: {group_info['name']} for category: {category}")
+                    await self._acache_set("group", category, group_info, GROUP_CACHE_TTL)
+                    logger.info("Found assignment group: %s for category: %s", group_info['name'], category)
                     return group_info
             
             # If no mapping found, try to use a real group from your ServiceNow instance
             # Based on your API response, let's use "Analytics Settings Managers"
             fallback_group_name = "Analytics Settings Managers"
-            result = self.servicenow_api.lookup_group_by_name(fallback_group_name)
+            result = await self.servicenow_api.alookup_group_by_name(fallback_group_name)
             
             if result.get("found"):
                 group_info = {
                     "sys_id": result.get("sys_id"),
                     "name": result.get("name")
                 }
-                self._group_cache[cache_key] = group_info
-                logger.info(f"Using fallback group: {group_info['name']} for category: {category}")
+                await self._acache_set("group", category, group_info, GROUP_CACHE_TTL)
+                logger.info("Using fallback group: %s for category: %s", group_info['name'], category)
                 return group_info
+            
+            # Remember the miss unless the lookup itself failed
+            if not result.get("error"):
+                await self._acache_set("group", category, {"sys_id": "", "name": "", "_negative": True}, NEGATIVE_CACHE_TTL)
                 
             # Final fallback if nothing works
             return self._get_fallback_group()
             
         except Exception as e:
-            logger.error(f"Error looking up assignment group for {category}: {e}")
+            logger.error("Error looking up assignment group for %s: %s", category, e)
             return self._get_fallback_group()
         
     def _get_fallback_group(self) -> Dict[str, Any]:
@@ -351,56 +593,45 @@ class ServiceNowAgent:
             }
         }
     }
-    def _lookup_assigned_user(self, category: str) -> Dict[str, Any]:
+    async def _alookup_assigned_user(self, category: str) -> Dict[str, Any]:
         """Lookup assigned user based on category"""
-        cache_key = f"user_{category}"
-        
-        # Check cache
-        if cache_key in self._user_cache:
-            return self._user_cache[cache_key]
+        # Check cache (including remembered misses)
+        cached = self._cache_get("assigned", category)
+        if cached is not None:
+            return {"sys_id": "", "name": ""} if cached.get("_negative") else cached
         
         try:
             # Get user mapping from config
-            user_mappings = self.config.get_setting("category_to_user", {})
-            mapped_user = user_mappings.get(category)
+            mapped_user = self._user_mappings.get(category)
             
             if mapped_user:
                 # Lookup user in ServiceNow
-                result = self.servicenow_api.lookup_user_by_username(mapped_user)
+                result = await self.servicenow_api.alookup_user_by_username(mapped_user)
                 
                 if result.get("found"):
                     user_info = {
                         "sys_id": result.get("sys_id"),
                         "name": result.get("name")
                     }
-                    self._user_cache[cache_key] = user_info
+                    await self._acache_set("assigned", category, user_info, GROUP_CACHE_TTL)
                     return user_info
+                
+                if result.get("error"):
+                    return {"sys_id": "", "name": ""}
+            
+            # Remember unmapped or unknown users
+            await self._acache_set("assigned", category, {"sys_id": "", "name": "", "_negative": True}, NEGATIVE_CACHE_TTL)
             
             # No specific user assignment
             return {"sys_id": "", "name": ""}
             
         except Exception as e:
-            logger.error(f"Error looking up assigned user for {category}: {e}")
+            logger.error("Error looking up assigned user for %s: %s", category, e)
             return {"sys_id": "", "name": ""}
     
     def _map_category_to_servicenow(self, category: str) -> str:
         """Map internal category to ServiceNow category values"""
-        category_mappings = self.config.get_setting("servicenow_category_mapping", {})
-        
-        # Use mapping if available
-        if category in category_mappings:
-            return category_mappings[category]
-        
-        # Default mappings
-        default_mappings = {
-            "IT": "Software",
-            "HR": "Human Resources",
-            "Finance": "Finance",
-            "Facilities": "Facilities",
-            "General": "General"
-        }
-        
-        return default_mappings.get(category, "General")
+        return self._category_map.get(category) or _DEFAULT_CATEGORY_MAP.get(category, "General")
     
     def update_incident(self, sys_id: str, update_data: Dict[str, Any]) -> Dict[str, Any]:
         """Update existing incident in ServiceNow"""
@@ -408,14 +639,14 @@ class ServiceNowAgent:
             result = self.servicenow_api.update_incident(sys_id, update_data)
             
             if result.get("success"):
-                logger.info(f"Successfully updated incident {sys_id}")
+                logger.info("Successfully updated incident %s", sys_id)
                 return {"success": True}
             else:
-                logger.error(f"Failed to update incident {sys_id}: {result.get('error')}")
+                logger.error("Failed to update incident %s: %s", sys_id, result.get('error'))
                 return {"success": False, "error": result.get("error")}
                 
         except Exception as e:
-            logger.error(f"Error updating incident {sys_id}: {e}")
+            logger.error("Error updating incident %s: %s", sys_id, e)
             return {"success": False, "error": str(e)}
     
     def get_incident_status(self, sys_id: str) -> Dict[str, Any]:
@@ -436,7 +667,28 @@ class ServiceNowAgent:
                 return {"found": False}
                 
         except Exception as e:
-            logger.error(f"Error getting incident status {sys_id}: {e}")
+            logger.error("Error getting incident status %s: %s", sys_id, e)
+            return {"found": False, "error": str(e)}
+    
+    async def aget_incident_status(self, sys_id: str) -> Dict[str, Any]:
+        """Get current status of incident without blocking the event loop"""
+        try:
+            result = await self.servicenow_api.aget_incident(sys_id)
+            
+            if result.get("found"):
+                return {
+                    "found": True,
+                    "state": result.get("state"),
+                    "state_name": result.get("state_name"),
+                    "resolution_code": result.get("resolution_code"),
+                    "resolution_notes": result.get("resolution_notes"),
+                    "updated": result.get("sys_updated_on")
+                }
+            else:
+                return {"found": False}
+                
+        except Exception as e:
+            logger.error("Error getting incident status %s: %s", sys_id, e)
             return {"found": False, "error": str(e)}
     
     def add_comment_to_incident(self, sys_id: str, comment: str, comment_type: str = "work_notes") -> Dict[str, Any]:
@@ -445,41 +697,70 @@ class ServiceNowAgent:
             result = self.servicenow_api.add_comment(sys_id, comment, comment_type)
             
             if result.get("success"):
-                logger.debug(f"Added comment to incident {sys_id}")
+                logger.debug("Added comment to incident %s", sys_id)
                 return {"success": True}
             else:
-                logger.error(f"Failed to add comment to {sys_id}: {result.get('error')}")
+                logger.error("Failed to add comment to %s: %s", sys_id, result.get('error'))
                 return {"success": False, "error": result.get("error")}
                 
         except Exception as e:
-            logger.error(f"Error adding comment to {sys_id}: {e}")
+            logger.error("Error adding comment to %s: %s", sys_id, e)
             return {"success": False, "error": str(e)}
     
     def close_incident(self, sys_id: str, resolution_code: str = "Closed/Resolved by Caller", 
-                      resolution_notes: str = "") -> Dict[str, Any]:
-        """Close an incident"""
+                      resolution_notes: str = "", now: Optional[str] = None) -> Dict[str, Any]:
+        """Close an incident; now overrides the closed/resolved timestamp"""
         try:
-            close_data = {
-                "state": "6",  # Closed
-                "resolution_code": resolution_code,
-                "resolution_notes": resolution_notes,
-                "closed_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "resolved_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-            
+            close_data = _build_close_data(resolution_code, resolution_notes, now or _close_timestamp())
             result = self.servicenow_api.update_incident(sys_id, close_data)
-            
-            if result.get("success"):
-                logger.info(f"Successfully closed incident {sys_id}")
-                return {"success": True}
-            else:
-                logger.error(f"Failed to close incident {sys_id}: {result.get('error')}")
-                return {"success": False, "error": result.get("error")}
+            return self._close_result(sys_id, result)
+                
+        except Exception as e:
+            logger.error("Error closing incident %s: %s", sys_id, e)
+            return {"success": False, "error": str(e)}
+    
+    async def aclose_incident(self, sys_id: str, resolution_code: str = "Closed/Resolved by Caller",
+                              resolution_notes: str = "", now: Optional[str] = None) -> Dict[str, Any]:
+        """Close an incident without blocking the event loop"""
+        try:
+            close_data = _build_close_data(resolution_code, resolution_notes, now or _close_timestamp())
+            result = await self.servicenow_api.aupdate_incident(sys_id, close_data)
+            return self._close_result(sys_id, result)
                 
         except Exception as e:
-            logger.error(f"Error closing incident {sys_id}: {e}")
+            logger.error("Error closing incident %s: %s", sys_id, e)
             return {"success": False, "error": str(e)}
     
+    async def aclose_incidents(self, sys_ids: List[str], resolution_code: str = "Closed/Resolved by Caller",
+                               resolution_notes: str = "") -> List[Dict[str, Any]]:
+        """
+        Close many incidents concurrently, at most servicenow_concurrency at a time
+        
+        All incidents share one closed/resolved timestamp. Returns one
+        {"sys_id", "success", "error"?} entry per sys_id, in order.
+        """
+        now_str = _close_timestamp()
+        results = await asyncio.gather(
+            *(self._bounded(self.aclose_incident(sys_id, resolution_code, resolution_notes, now_str))
+              for sys_id in sys_ids),
+            return_exceptions=True
+        )
+        
+        return [
+            {"sys_id": sys_id, "success": False, "error": str(result)}
+            if isinstance(result, Exception) else {"sys_id": sys_id, **result}
+            for sys_id, result in zip(sys_ids, results)
+        ]
+    
+    def _close_result(self, sys_id: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Log and shape the outcome of a close update"""
+        if result.get("success"):
+            logger.info("Successfully closed incident %s", sys_id)
+            return {"success": True}
+        else:
+            logger.error("Failed to close incident %s: %s", sys_id, result.get('error'))
+            return {"success": False, "error": result.get("error")}
+    
     def search_incidents_by_email(self, email: str, days_back: int = 30) -> List[Dict[str, Any]]:
         """Search for recent incidents by caller email"""
         try:
@@ -487,14 +768,31 @@ class ServiceNowAgent:
             
             if result.get("success"):
                 incidents = result.get("incidents", [])
-                logger.debug(f"Found {len(incidents)} incidents for {email}")
+                logger.debug("Found %s incidents for %s", len(incidents), email)
                 return incidents
             else:
-                logger.error(f"Failed to search incidents for {email}: {result.get('error')}")
+                logger.error("Failed to search incidents for %s: %s", email, result.get('error'))
                 return []
                 
         except Exception as e:
-            logger.error(f"Error searching incidents for {email}: {e}")
+            logger.error("Error searching incidents for %s: %s", email, e)
+            return []
+    
+    async def asearch_incidents_by_email(self, email: str, days_back: int = 30) -> List[Dict[str, Any]]:
+        """Search for recent incidents by caller email without blocking the event loop"""
+        try:
+            result = await self.servicenow_api.asearch_incidents_by_caller_email(email, days_back)
+            
+            if result.get("success"):
+                incidents = result.get("incidents", [])
+                logger.debug("Found %s incidents for %s", len(incidents), email)
+                return incidents
+            else:
+                logger.error("Failed to search incidents for %s: %s", email, result.get('error'))
+                return []
+                
+        except Exception as e:
+            logger.error("Error searching incidents for %s: %s", email, e)
             return []
     
     def get_incident_metrics(self) -> Dict[str, Any]:
@@ -512,13 +810,19 @@ class ServiceNowAgent:
             return metrics
             
         except Exception as e:
-            logger.error(f"Error getting incident metrics: {e}")
+            logger.error("Error getting incident metrics: %s", e)
             return {}
     
+    @cachedmethod(lambda self: self._connection_status_cache, lock=lambda self: self._cache_lock)
     def validate_servicenow_connection(self) -> bool:
         """Validate connection to ServiceNow instance"""
         try:
             return self.servicenow_api.test_connection()
         except Exception as e:
-            logger.error(f"ServiceNow connection validation failed: {e}")
-            return False
\ No newline at end of file
+            logger.error("ServiceNow connection validation failed: %s", e)
+            return False
+    
+    async def aclose(self):
+        """Close the pooled HTTP clients and the on-disk cache"""
+        await self.servicenow_api.aclose()
+        self._disk_cache.close()
@@ -104,7 +104,7 @@ class TrackerAgent:
             caller_email = ticket_data.get("caller_email", "")
             
             # Get current status from ServiceNow
-            status_result = self.servicenow_agent.get_incident_status(sys_id)
+            status_result = await self.servicenow_agent.aget_incident_status(sys_id)
             
             if not status_result.get("found"):
                 logger.warning(f"Ticket {ticket_number} not found in ServiceNow")
@@ -462,4 +462,8 @@ class TrackerAgent:
             
         except Exception as e:
             logger.error(f"Error importing tracking data: {e}")
-            return {"success": False, "error": str(e)}
\ No newline at end of file
+            return {"success": False, "error": str(e)}
+    
+    async def aclose(self):
+        """Close the ServiceNow connection pool"""
+        await self.servicenow_agent.aclose()
@@ -6,62 +6,66 @@ Main application entry point with background scheduler for agentic workflow
 import logging
 import asyncio
 from contextlib import asynccontextmanager
+import cachetools.func
 from fastapi import FastAPI, HTTPException
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.interval import IntervalTrigger
 
 from agents.scheduler import SchedulerAgent
-from utils.logger import setup_logger
+from utils.logger import setup_logger, setup_application_logging, stop_application_logging
 from tools.config_loader import ConfigLoader
 
 # Setup logging
 logger = setup_logger(__name__)
 
-# Global scheduler instance
-scheduler = None
+# Global scheduler task
+scheduler_task = None
 scheduler_agent = None
+config = None
+
+# Seconds between email checks
+CHECK_INTERVAL_SECONDS = 60
+
+# Seconds a /health result is reused before it is recomputed
+HEALTH_CACHE_TTL = 30
+
+@cachetools.func.ttl_cache(maxsize=1, ttl=HEALTH_CACHE_TTL)
+def _cached_config_status() -> bool:
+    """Validate the loaded configuration at most once per TTL window"""
+    return config.validate_config()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """FastAPI lifespan context manager for startup/shutdown events"""
-    global scheduler, scheduler_agent
+    global scheduler_task, scheduler_agent, config
     
     try:
+        # Route log files through the background listener so logging never blocks the event loop
+        setup_application_logging()
+        
         # Load configuration
         config = ConfigLoader()
         
         # Initialize scheduler agent
         scheduler_agent = SchedulerAgent(config)
         
-        # Create and start the background scheduler
-        scheduler = AsyncIOScheduler()
-        
-        # Add job to check emails every 10 minutes
-        scheduler.add_job(
-            func=scheduler_agent.trigger_workflow,
-            trigger=IntervalTrigger(minutes=1),
-            id='email_check_job',
-            name='Check emails and process tickets',
-            replace_existing=True
-        )
-        
-        scheduler.start()
-        logger.info("Background scheduler started - checking emails every 10 minutes")
-        
-        # Initial run
-        asyncio.create_task(scheduler_agent.trigger_workflow())
-        logger.info("Initial workflow triggered")
+        # Start the background loop; its first run happens immediately
+        scheduler_task = asyncio.create_task(scheduler_agent.run_periodically(CHECK_INTERVAL_SECONDS))
+        logger.info("Background scheduler started - checking emails every %s seconds", CHECK_INTERVAL_SECONDS)
         
         yield
         
     except Exception as e:
-        logger.error(f"Error during application startup: {e}")
+        logger.error("Error during application startup: %s", e)
         raise
     finally:
         # Cleanup on shutdown
-        if scheduler:
-            scheduler.shutdown()
+        if scheduler_task:
+            scheduler_task.cancel()
+            await asyncio.gather(scheduler_task, return_exceptions=True)
             logger.info("Background scheduler stopped")
+        if scheduler_agent:
+            await scheduler_agent.aclose()
+            logger.info("ServiceNow connections closed")
+        stop_application_logging()
 
 # Initialize FastAPI app with lifespan
 app = FastAPI(
@@ -77,22 +81,22 @@ async def root():
     return {
         "status": "running",
         "message": "ServiceNow Ticket Automation Service is active",
-        "scheduler_status": "running" if scheduler and scheduler.running else "stopped"
+        "scheduler_status": "running" if scheduler_task and not scheduler_task.done() else "stopped"
     }
 
 @app.get("/health")
 async def health_check():
     """Detailed health check endpoint"""
     try:
-        config_status = ConfigLoader().validate_config()
+        config_status = _cached_config_status() if config else False
         return {
             "status": "healthy",
-            "scheduler_running": scheduler.running if scheduler else False,
+            "scheduler_running": bool(scheduler_task and not scheduler_task.done()),
             "config_valid": config_status,
-            "next_run": str(scheduler.get_job('email_check_job').next_run_time) if scheduler else None
+            "next_run": str(scheduler_agent.next_run_time) if scheduler_agent else None
         }
     except Exception as e:
-        logger.error(f"Health check failed: {e}")
+        logger.error("Health check failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Health check failed: {str(e)}")
 
 @app.post("/trigger-manual")
@@ -105,9 +109,22 @@ async def trigger_manual():
         else:
             raise HTTPException(status_code=500, detail="Scheduler agent not initialized")
     except Exception as e:
-        logger.error(f"Manual trigger failed: {e}")
+        logger.error("Manual trigger failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Manual trigger failed: {str(e)}")
 
+@app.post("/cache/clear")
+async def clear_cache():
+    """Invalidate the ServiceNow user and group lookup caches"""
+    try:
+        if scheduler_agent:
+            await scheduler_agent.aclear_caches()
+            return {"status": "success", "message": "Lookup caches cleared"}
+        else:
+            raise HTTPException(status_code=500, detail="Scheduler agent not initialized")
+    except Exception as e:
+        logger.error("Cache clear failed: %s", e)
+        raise HTTPException(status_code=500, detail=f"Cache clear failed: {str(e)}")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
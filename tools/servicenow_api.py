@@ -3,20 +3,67 @@ ServiceNow API Helper - REST API interactions with ServiceNow
 """
 
 import logging
+import asyncio
+import contextvars
+import threading
 import httpx
 import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 import base64
-import requests
 from utils.logger import setup_logger
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = setup_logger(__name__)
 
+# Connection pool sizing shared by the long-lived HTTP clients
+POOL_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=60)
+
+# Default maximum number of in-flight async requests per event loop, used
+# when the servicenow_concurrency setting is absent
+MAX_CONCURRENT_REQUESTS = 10
+
+# Temporary (client, semaphore) that replaces the shared AsyncClient inside
+# ServiceNowAPI.scoped_async_client(); copied into tasks spawned from the block
+_scoped_async: contextvars.ContextVar = contextvars.ContextVar("servicenow_scoped_async", default=None)
+
+# Maximum number of emails per batched sys_user IN-query
+USER_LOOKUP_BATCH_SIZE = 50
+
+# Row cap for a batched sys_user query, well above the batch size because one
+# address can match several sys_user records
+USER_LOOKUP_ROW_LIMIT = 1000
+
+def _dumps(data: Any) -> bytes:
+    """Serialize a request body to JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode("utf-8")
+
+def _loads(content: bytes) -> Any:
+    """Parse a JSON response body, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+def create_client() -> httpx.Client:
+    """Create a pooled Client for ServiceNow REST calls"""
+    return httpx.Client(limits=POOL_LIMITS, http2=True)
+
+def create_async_client() -> httpx.AsyncClient:
+    """Create a pooled AsyncClient for ServiceNow REST calls"""
+    return httpx.AsyncClient(limits=POOL_LIMITS, http2=True)
+
 class ServiceNowAPI:
     """Helper class for ServiceNow REST API interactions"""
     
-    def __init__(self, config):
+    def __init__(self, config, client: Optional[httpx.Client] = None,
+                 async_client: Optional[httpx.AsyncClient] = None):
         self.config = config
         
         # ServiceNow configuration
@@ -36,6 +83,18 @@ class ServiceNowAPI:
         # HTTP client configuration
         self.timeout = 30
         
+        # Cap on in-flight async requests, shared by every lookup, batch and write
+        self.max_concurrent_requests = self.config.get_setting("servicenow_concurrency", MAX_CONCURRENT_REQUESTS)
+        
+        # Long-lived pooled client so connections and TLS sessions are reused
+        self._client = client or create_client()
+        
+        # Long-lived async client and the event loop it is bound to
+        self._async_client = async_client
+        self._async_loop = None
+        self._async_semaphore = None
+        self._async_lock = threading.Lock()
+        
     def _get_auth_headers(self) -> Dict[str, str]:
         """Get authentication headers for API requests"""
         auth_string = f"{self.username}:{self.password}"
@@ -48,26 +107,325 @@ class ServiceNowAPI:
             "Accept": "application/json"
         }
     
-    def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None, params: Optional[Dict] = None) -> Dict[str, Any]:
+    def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None, params: Optional[Dict] = None,
+                      headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """
         Internal helper for making REST API requests
+        
+        A 304 reply to a conditional request is returned as success with
+        not_modified set and no data.
         """
         url = f"{self.api_base}/{endpoint}"
         try:
-            response = requests.request(
+            response = self._client.request(
                 method,
                 url,
                 auth=(self.username, self.password),
-                headers={"Content-Type": "application/json"},
-                json=data,
+                headers={"Content-Type": "application/json", **(headers or {})},
+                content=_dumps(data) if data is not None else None,
                 params=params,   # ✅ allow query params here
-                timeout=30
+                timeout=self.timeout
             )
-            response.raise_for_status()
-            return {"success": True, "data": response.json()}
-        except requests.exceptions.RequestException as e:
+            return self._parse_response(response)
+        except (httpx.HTTPError, ValueError) as e:
+            return {"success": False, "error": str(e)}
+
+    def _get_async_client(self) -> Tuple[httpx.AsyncClient, asyncio.Semaphore]:
+        """
+        Return the AsyncClient and request semaphore for the running event loop
+        
+        Inside scoped_async_client() this is the temporary client of that block.
+        Otherwise it is the long-lived client, bound to the first loop that uses
+        it; connections cannot be shared between event loops, so a fresh client
+        is created if another long-lived loop takes over.
+        """
+        scoped = _scoped_async.get()
+        if scoped is not None:
+            return scoped
+        
+        loop = asyncio.get_running_loop()
+        with self._async_lock:
+            if self._async_loop is not loop:
+                if self._async_client is None or self._async_loop is not None:
+                    self._async_client = create_async_client()
+                self._async_loop = loop
+                self._async_semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+            return self._async_client, self._async_semaphore
+
+    @asynccontextmanager
+    async def scoped_async_client(self):
+        """
+        Route async calls made inside the block through a temporary AsyncClient
+        
+        For synchronous façades that run on a short-lived event loop of their
+        own: the client is closed on exit and the long-lived client is untouched.
+        """
+        client = create_async_client()
+        token = _scoped_async.set((client, asyncio.Semaphore(self.max_concurrent_requests)))
+        try:
+            yield client
+        finally:
+            _scoped_async.reset(token)
+            await client.aclose()
+
+    async def _amake_request(self, method: str, endpoint: str, data: Optional[Dict] = None, params: Optional[Dict] = None,
+                             headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Async counterpart of _make_request using the pooled AsyncClient
+        """
+        url = f"{self.api_base}/{endpoint}"
+        client, semaphore = self._get_async_client()
+        try:
+            async with semaphore:
+                response = await client.request(
+                    method,
+                    url,
+                    auth=(self.username, self.password),
+                    headers={"Content-Type": "application/json", **(headers or {})},
+                    content=_dumps(data) if data is not None else None,
+                    params=params,
+                    timeout=self.timeout
+                )
+            return self._parse_response(response)
+        except (httpx.HTTPError, ValueError) as e:
             return {"success": False, "error": str(e)}
 
+    @staticmethod
+    def _parse_response(response: httpx.Response) -> Dict[str, Any]:
+        """Shape an HTTP response into a request result, keeping its ETag"""
+        etag = response.headers.get("ETag")
+        if response.status_code == 304:
+            return {"success": True, "not_modified": True, "etag": etag}
+        response.raise_for_status()
+        return {"success": True, "data": _loads(response.content), "etag": etag}
+
+    def close(self):
+        """Close the pooled Client"""
+        self._client.close()
+
+    async def aclose(self):
+        """Close the pooled Client and AsyncClient"""
+        self.close()
+        if self._async_client is not None:
+            await self._async_client.aclose()
+
+    @staticmethod
+    def _format_user(user: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape a sys_user record into a lookup result"""
+        return {
+            "found": True,
+            "sys_id": user.get("sys_id"),
+            "name": user.get("name"),
+            "email": user.get("email"),
+            "user_name": user.get("user_name"),
+            "active": user.get("active") == "true"
+        }
+
+    @staticmethod
+    def _format_group(group: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape a sys_user_group record into a lookup result"""
+        return {
+            "found": True,
+            "sys_id": group.get("sys_id"),
+            "name": group.get("name"),
+            "description": group.get("description"),
+            "active": group.get("active") == "true"
+        }
+
+    @staticmethod
+    def _format_first_user(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape a sys_user query response into a single-user lookup result"""
+        if result.get("success"):
+            if result.get("not_modified"):
+                return {"found": True, "not_modified": True, "etag": result.get("etag")}
+            users = result.get("data", {}).get("result", [])
+            if users:
+                user = ServiceNowAPI._format_user(users[0])
+                user["etag"] = result.get("etag")
+                return user
+            return {"found": False}
+        return {"found": False, "error": result.get("error")}
+
+    @staticmethod
+    def _user_batch_params(emails: List[str]) -> Dict[str, str]:
+        """Build query params for a batched sys_user lookup by email"""
+        return {
+            "sysparm_query": f"emailIN{','.join(emails)}",
+            "sysparm_fields": "sys_id,name,email,user_name,active",
+            "sysparm_limit": str(USER_LOOKUP_ROW_LIMIT)
+        }
+
+    @staticmethod
+    def _format_user_batch(result: Dict[str, Any], emails: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Map a batched sys_user response back onto the requested emails (misses as found=False)"""
+        if not result.get("success"):
+            logger.error(f"Error looking up users by email batch: {result.get('error')}")
+            return {}
+        
+        # ServiceNow matches emails case-insensitively
+        requested = {}
+        for email in emails:
+            requested.setdefault(email.lower(), []).append(email)
+        
+        found = {}
+        for user in result.get("data", {}).get("result", []):
+            for email in requested.get((user.get("email") or "").lower(), []):
+                found.setdefault(email, ServiceNowAPI._format_user(user))
+        
+        # Report misses too, so callers can tell "no such user" from a failed batch
+        return {email: found.get(email, {"found": False}) for email in emails}
+
+    @staticmethod
+    def _format_created_incident(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape an incident POST response into a creation result"""
+        if not result.get("success"):
+            logger.error(f"Failed to create incident: {result.get('error')}")
+            return {"success": False, "error": result.get("error")}
+        
+        response_data = result.get("data", {}).get("result", {})
+        
+        # Extract assignment information
+        assignment_group = response_data.get("assignment_group", {})
+        if isinstance(assignment_group, dict):
+            assignment_group_value = assignment_group.get("value", "")
+            assignment_group_display = assignment_group.get("display_value", "")
+        else:
+            assignment_group_value = assignment_group
+            assignment_group_display = assignment_group
+        
+        assigned_to = response_data.get("assigned_to", {})
+        if isinstance(assigned_to, dict):
+            assigned_to_value = assigned_to.get("value", "")
+            assigned_to_display = assigned_to.get("display_value", "")
+        else:
+            assigned_to_value = assigned_to
+            assigned_to_display = assigned_to
+        
+        logger.info(f"Incident created successfully: {response_data.get('number')}")
+        logger.info(f"Assignment Group: {assignment_group_display} ({assignment_group_value})")
+        logger.info(f"Assigned To: {assigned_to_display} ({assigned_to_value})")
+        
+        return {
+            "success": True,
+            "sys_id": response_data.get("sys_id"),
+            "ticket_number": response_data.get("number"),
+            "state": response_data.get("state"),
+            "assigned_to": assigned_to_display,
+            "assignment_group": assignment_group_display
+        }
+
+    @staticmethod
+    def _format_incident(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape an incident GET response into an incident lookup result"""
+        def safe_display(field: Any) -> str:
+            if isinstance(field, dict):
+                return field.get("display_value", "")
+            elif field:  # non-empty string or number
+                return str(field)
+            return ""
+        
+        if not result.get("success"):
+            return {"found": False, "error": result.get("error")}
+        
+        incident_data = result.get("data", {}).get("result", {})
+        if not incident_data:
+            return {"found": False}
+        
+        return {
+            "found": True,
+            "sys_id": incident_data.get("sys_id"),
+            "number": incident_data.get("number"),
+            "state": incident_data.get("state"),
+            "state_name": safe_display(incident_data.get("state")),
+            "short_description": incident_data.get("short_description"),
+            "description": incident_data.get("description"),
+            "caller_id": safe_display(incident_data.get("caller_id")),
+            "assigned_to": safe_display(incident_data.get("assigned_to")),
+            "assignment_group": safe_display(incident_data.get("assignment_group")),
+            "priority": incident_data.get("priority"),
+            "urgency": incident_data.get("urgency"),
+            "category": incident_data.get("category"),
+            "subcategory": incident_data.get("subcategory"),
+            "resolution_code": incident_data.get("resolution_code"),
+            "resolution_notes": incident_data.get("resolution_notes"),
+            "sys_created_on": incident_data.get("sys_created_on"),
+            "sys_updated_on": incident_data.get("sys_updated_on")
+        }
+
+    @staticmethod
+    def _format_created_user(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape a sys_user POST response into a creation result"""
+        if not result.get("success"):
+            return {"success": False, "error": result.get("error")}
+        
+        user_result = result.get("data", {}).get("result", {})
+        return {
+            "success": True,
+            "sys_id": user_result.get("sys_id"),
+            "name": user_result.get("name"),
+            "user_name": user_result.get("user_name"),
+            "email": user_result.get("email")
+        }
+
+    @staticmethod
+    def _format_group_members(result: Dict[str, Any], group_sys_id: str) -> Dict[str, Any]:
+        """Shape a sys_user_grmember response into a group members result"""
+        if not result.get("success"):
+            logger.error(f"Error getting group members: {result.get('error')}")
+            return {"success": False, "error": result.get("error")}
+        
+        members_data = result.get("data", {}).get("result", [])
+        logger.debug(f"Found {len(members_data)} members in group {group_sys_id}")
+        
+        # Format the response to extract user information
+        formatted_members = []
+        for member in members_data:
+            formatted_members.append({
+                "sys_id": member.get("user.sys_id", ""),
+                "email": member.get("user.email", ""),
+                "name": member.get("user.name", ""),
+                "user_name": member.get("user.user_name", "")
+            })
+        
+        return {
+            "success": True,
+            "members": formatted_members,
+            "total_members": len(formatted_members)
+        }
+
+    @staticmethod
+    def _incident_search_params(user_sys_id: str, days_back: int) -> Dict[str, str]:
+        """Build query params for a caller's recent incidents"""
+        start_date = datetime.now() - timedelta(days=days_back)
+        return {
+            "sysparm_query": f"caller_id={user_sys_id}^sys_created_on>={start_date.strftime('%Y-%m-%d')}",
+            "sysparm_limit": "100",
+            "sysparm_order": "sys_created_on"
+        }
+
+    @staticmethod
+    def _format_incident_search(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape an incident query response into a search result"""
+        if not result.get("success"):
+            return {"success": False, "error": result.get("error")}
+        
+        incidents = result.get("data", {}).get("result", [])
+        formatted_incidents = []
+        
+        for incident in incidents:
+            formatted_incidents.append({
+                "sys_id": incident.get("sys_id"),
+                "number": incident.get("number"),
+                "short_description": incident.get("short_description"),
+                "state": incident.get("state"),
+                "state_name": incident.get("state", {}).get("display_value", ""),
+                "priority": incident.get("priority"),
+                "created_on": incident.get("sys_created_on"),
+                "updated_on": incident.get("sys_updated_on")
+            })
+        
+        return {"success": True, "incidents": formatted_incidents}
+
     # In servicenow_api.py, make sure the create_incident method is working correctly
 
     def create_incident(self, incident_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -82,45 +440,33 @@ class ServiceNowAPI:
         """
         try:
             logger.info("Creating incident in ServiceNow")
-            logger.debug(f"Incident data: {json.dumps(incident_data, indent=2)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Incident data: %s", json.dumps(incident_data, indent=2))
             
             result = self._make_request("POST", "incident", data=incident_data)
-            
-            if result.get("success"):
-                response_data = result.get("data", {}).get("result", {})
+            return self._format_created_incident(result)
                 
-                # Extract assignment information
-                assignment_group = response_data.get("assignment_group", {})
-                if isinstance(assignment_group, dict):
-                    assignment_group_value = assignment_group.get("value", "")
-                    assignment_group_display = assignment_group.get("display_value", "")
-                else:
-                    assignment_group_value = assignment_group
-                    assignment_group_display = assignment_group
-                
-                assigned_to = response_data.get("assigned_to", {})
-                if isinstance(assigned_to, dict):
-                    assigned_to_value = assigned_to.get("value", "")
-                    assigned_to_display = assigned_to.get("display_value", "")
-                else:
-                    assigned_to_value = assigned_to
-                    assigned_to_display = assigned_to
-                
-                logger.info(f"Incident created successfully: {response_data.get('number')}")
-                logger.info(f"Assignment Group: {assignment_group_display} ({assignment_group_value})")
-                logger.info(f"Assigned To: {assigned_to_display} ({assigned_to_value})")
-                
-                return {
-                    "success": True,
-                    "sys_id": response_data.get("sys_id"),
-                    "ticket_number": response_data.get("number"),
-                    "state": response_data.get("state"),
-                    "assigned_to": assigned_to_display,
-                    "assignment_group": assignment_group_display
-                }
-            else:
-                logger.error(f"Failed to create incident: {result.get('error')}")
-                return {"success": False, "error": result.get("error")}
+        except Exception as e:
+            logger.error(f"Error creating incident: {e}")
+            return {"success": False, "error": str(e)}
+
+    async def acreate_incident(self, incident_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async variant of create_incident
+        
+        Args:
+            incident_data: Incident data dictionary
+            
+        Returns:
+            Dict containing creation result with sys_id and number
+        """
+        try:
+            logger.info("Creating incident in ServiceNow")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Incident data: %s", json.dumps(incident_data, indent=2))
+            
+            result = await self._amake_request("POST", "incident", data=incident_data)
+            return self._format_created_incident(result)
                 
         except Exception as e:
             logger.error(f"Error creating incident: {e}")
@@ -137,44 +483,27 @@ class ServiceNowAPI:
             Dict containing incident data
             
         """
-        def safe_display(field: Any) -> str:
-            if isinstance(field, dict):
-                return field.get("display_value", "")
-            elif field:  # non-empty string or number
-                return str(field)
-            return ""
         try:
             result = self._make_request("GET", f"incident/{sys_id}")
-           
-            if result.get("success"):
-                incident_data = result.get("data", {}).get("result", {})
+            return self._format_incident(result)
                 
-                if incident_data:
-                    return {
-                        "found": True,
-                        "sys_id": incident_data.get("sys_id"),
-                        "number": incident_data.get("number"),
-                        "state": incident_data.get("state"),
-                        "state_name": safe_display(incident_data.get("state")),
-                        "short_description": incident_data.get("short_description"),
-                        "description": incident_data.get("description"),
-                        "caller_id": safe_display(incident_data.get("caller_id")),
-                        "assigned_to": safe_display(incident_data.get("assigned_to")),
-                        "assignment_group": safe_display(incident_data.get("assignment_group")),
-                        "priority": incident_data.get("priority"),
-                        "urgency": incident_data.get("urgency"),
-                        "category": incident_data.get("category"),
-                        "subcategory": incident_data.get("subcategory"),
-                        "resolution_code": incident_data.get("resolution_code"),
-                        "resolution_notes": incident_data.get("resolution_notes"),
-                        "sys_created_on": incident_data.get("sys_created_on"),
-                        "sys_updated_on": incident_data.get("sys_updated_on")
-                    }
+        except Exception as e:
+            logger.error(f"Error getting incident {sys_id}: {e}")
+            return {"found": False, "error": str(e)}
 
-                else:
-                    return {"found": False}
-            else:
-                return {"found": False, "error": result.get("error")}
+    async def aget_incident(self, sys_id: str) -> Dict[str, Any]:
+        """
+        Async variant of get_incident
+        
+        Args:
+            sys_id: ServiceNow sys_id of the incident
+            
+        Returns:
+            Dict containing incident data
+        """
+        try:
+            result = await self._amake_request("GET", f"incident/{sys_id}")
+            return self._format_incident(result)
                 
         except Exception as e:
             logger.error(f"Error getting incident {sys_id}: {e}")
@@ -202,6 +531,29 @@ class ServiceNowAPI:
         except Exception as e:
             logger.error(f"Error updating incident {sys_id}: {e}")
             return {"success": False, "error": str(e)}
+
+    async def aupdate_incident(self, sys_id: str, update_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async variant of update_incident
+        
+        Args:
+            sys_id: ServiceNow sys_id of the incident
+            update_data: Data to update
+            
+        Returns:
+            Dict containing update result
+        """
+        try:
+            result = await self._amake_request("PUT", f"incident/{sys_id}", data=update_data)
+            
+            if result.get("success"):
+                return {"success": True, "message": "Incident updated successfully"}
+            else:
+                return {"success": False, "error": result.get("error")}
+                
+        except Exception as e:
+            logger.error(f"Error updating incident {sys_id}: {e}")
+            return {"success": False, "error": str(e)}
     
     def add_comment(self, sys_id: str, comment: str, comment_type: str = "work_notes") -> Dict[str, Any]:
         """
@@ -223,45 +575,110 @@ class ServiceNowAPI:
             logger.error(f"Error adding comment to {sys_id}: {e}")
             return {"success": False, "error": str(e)}
     
-    def lookup_user_by_email(self, email: str) -> Dict[str, Any]:
+    def lookup_user_by_email(self, email: str, etag: Optional[str] = None) -> Dict[str, Any]:
         """
         Lookup user by email address
         
         Args:
             email: Email address to search for
+            etag: ETag from a previous lookup; if the record is unchanged the
+                result has not_modified set instead of user fields
             
         Returns:
-            Dict containing user information
+            Dict containing user information and its etag
         """
         try:
             params = {
                 "sysparm_query": f"email={email}",
                 "sysparm_limit": "1"
             }
+            headers = {"If-None-Match": etag} if etag else None
             
-            result = self._make_request("GET", "sys_user", params=params)
+            result = self._make_request("GET", "sys_user", params=params, headers=headers)
+            return self._format_first_user(result)
+                
+        except Exception as e:
+            logger.error(f"Error looking up user by email {email}: {e}")
+            return {"found": False, "error": str(e)}
+
+    async def alookup_user_by_email(self, email: str, etag: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Async variant of lookup_user_by_email
+        
+        Args:
+            email: Email address to search for
+            etag: ETag from a previous lookup
             
-            if result.get("success"):
-                users = result.get("data", {}).get("result", [])
-                if users:
-                    user = users[0]
-                    return {
-                        "found": True,
-                        "sys_id": user.get("sys_id"),
-                        "name": user.get("name"),
-                        "email": user.get("email"),
-                        "user_name": user.get("user_name"),
-                        "active": user.get("active") == "true"
-                    }
-                else:
-                    return {"found": False}
-            else:
-                return {"found": False, "error": result.get("error")}
+        Returns:
+            Dict containing user information and its etag
+        """
+        try:
+            params = {
+                "sysparm_query": f"email={email}",
+                "sysparm_limit": "1"
+            }
+            headers = {"If-None-Match": etag} if etag else None
+            
+            result = await self._amake_request("GET", "sys_user", params=params, headers=headers)
+            return self._format_first_user(result)
                 
         except Exception as e:
             logger.error(f"Error looking up user by email {email}: {e}")
             return {"found": False, "error": str(e)}
     
+    def lookup_users_by_emails(self, emails: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Lookup many users by email address with batched IN-queries
+        
+        Args:
+            emails: Email addresses to search for
+            
+        Returns:
+            Dict mapping each email in a successful batch to its user
+            information, or {"found": False} if no user matched; emails in
+            failed batches are left out
+        """
+        found = {}
+        unique_emails = list(dict.fromkeys(email for email in emails if email))
+        for i in range(0, len(unique_emails), USER_LOOKUP_BATCH_SIZE):
+            batch = unique_emails[i:i + USER_LOOKUP_BATCH_SIZE]
+            try:
+                result = self._make_request("GET", "sys_user", params=self._user_batch_params(batch))
+                found.update(self._format_user_batch(result, batch))
+            except Exception as e:
+                logger.error(f"Error looking up users by email batch: {e}")
+        return found
+
+    async def alookup_users_by_emails(self, emails: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Async variant of lookup_users_by_emails, issuing batches concurrently
+        
+        Args:
+            emails: Email addresses to search for
+            
+        Returns:
+            Dict mapping each email in a successful batch to its user
+            information, or {"found": False} if no user matched; emails in
+            failed batches are left out
+        """
+        unique_emails = list(dict.fromkeys(email for email in emails if email))
+        batches = [
+            unique_emails[i:i + USER_LOOKUP_BATCH_SIZE]
+            for i in range(0, len(unique_emails), USER_LOOKUP_BATCH_SIZE)
+        ]
+        results = await asyncio.gather(
+            *(self._amake_request("GET", "sys_user", params=self._user_batch_params(batch)) for batch in batches),
+            return_exceptions=True
+        )
+        
+        found = {}
+        for batch, result in zip(batches, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error looking up users by email batch: {result}")
+                continue
+            found.update(self._format_user_batch(result, batch))
+        return found
+    
     def lookup_user_by_username(self, username: str) -> Dict[str, Any]:
         """
         Lookup user by username
@@ -279,23 +696,30 @@ class ServiceNowAPI:
             }
             
             result = self._make_request("GET", "sys_user", params=params)
+            return self._format_first_user(result)
+                
+        except Exception as e:
+            logger.error(f"Error looking up user by username {username}: {e}")
+            return {"found": False, "error": str(e)}
+
+    async def alookup_user_by_username(self, username: str) -> Dict[str, Any]:
+        """
+        Async variant of lookup_user_by_username
+        
+        Args:
+            username: Username to search for
             
-            if result.get("success"):
-                users = result.get("data", {}).get("result", [])
-                if users:
-                    user = users[0]
-                    return {
-                        "found": True,
-                        "sys_id": user.get("sys_id"),
-                        "name": user.get("name"),
-                        "email": user.get("email"),
-                        "user_name": user.get("user_name"),
-                        "active": user.get("active") == "true"
-                    }
-                else:
-                    return {"found": False}
-            else:
-                return {"found": False, "error": result.get("error")}
+        Returns:
+            Dict containing user information
+        """
+        try:
+            params = {
+                "sysparm_query": f"user_name={username}",
+                "sysparm_limit": "1"
+            }
+            
+            result = await self._amake_request("GET", "sys_user", params=params)
+            return self._format_first_user(result)
                 
         except Exception as e:
             logger.error(f"Error looking up user by username {username}: {e}")
@@ -313,18 +737,25 @@ class ServiceNowAPI:
         """
         try:
             result = self._make_request("POST", "sys_user", data=user_data)
+            return self._format_created_user(result)
+                
+        except Exception as e:
+            logger.error(f"Error creating user: {e}")
+            return {"success": False, "error": str(e)}
+
+    async def acreate_user(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async variant of create_user
+        
+        Args:
+            user_data: User data dictionary
             
-            if result.get("success"):
-                user_result = result.get("data", {}).get("result", {})
-                return {
-                    "success": True,
-                    "sys_id": user_result.get("sys_id"),
-                    "name": user_result.get("name"),
-                    "user_name": user_result.get("user_name"),
-                    "email": user_result.get("email")
-                }
-            else:
-                return {"success": False, "error": result.get("error")}
+        Returns:
+            Dict containing creation result
+        """
+        try:
+            result = await self._amake_request("POST", "sys_user", data=user_data)
+            return self._format_created_user(result)
                 
         except Exception as e:
             logger.error(f"Error creating user: {e}")
@@ -351,33 +782,37 @@ class ServiceNowAPI:
             
             logger.debug(f"Getting members for group: {group_sys_id}")
             result = self._make_request("GET", "sys_user_grmember", params=params)
-            
-            if result.get("success"):
-                members_data = result.get("data", {}).get("result", [])
-                logger.debug(f"Found {len(members_data)} members in group {group_sys_id}")
-                
-                # Format the response to extract user information
-                formatted_members = []
-                for member in members_data:
-                    formatted_members.append({
-                        "sys_id": member.get("user.sys_id", ""),
-                        "email": member.get("user.email", ""),
-                        "name": member.get("user.name", ""),
-                        "user_name": member.get("user.user_name", "")
-                    })
-                
-                return {
-                    "success": True,
-                    "members": formatted_members,
-                    "total_members": len(formatted_members)
-                }
-            else:
-                logger.error(f"Error getting group members: {result.get('error')}")
-                return {"success": False, "error": result.get("error")}
+            return self._format_group_members(result, group_sys_id)
                 
         except Exception as e:
             logger.error(f"Error getting group members for {group_sys_id}: {e}")
             return {"success": False, "error": str(e)}    
+
+    async def aget_group_members(self, group_sys_id: str, limit: int = 50) -> Dict[str, Any]:
+        """
+        Async variant of get_group_members
+        
+        Args:
+            group_sys_id: ServiceNow sys_id of the group
+            limit: Maximum number of users to return
+            
+        Returns:
+            Dict containing group members information
+        """
+        try:
+            params = {
+                "sysparm_query": f"group={group_sys_id}",
+                "sysparm_fields": "user.name,user.email,user.user_name,user.sys_id",
+                "sysparm_limit": str(limit)
+            }
+            
+            logger.debug(f"Getting members for group: {group_sys_id}")
+            result = await self._amake_request("GET", "sys_user_grmember", params=params)
+            return self._format_group_members(result, group_sys_id)
+                
+        except Exception as e:
+            logger.error(f"Error getting group members for {group_sys_id}: {e}")
+            return {"success": False, "error": str(e)}
     def get_group_by_sys_id(self, group_sys_id: str) -> Dict[str, Any]:
         """
         Get group details by sys_id
@@ -430,14 +865,38 @@ class ServiceNowAPI:
             if result.get("success"):
                 groups = result.get("data", {}).get("result", [])
                 if groups:
-                    group = groups[0]
-                    return {
-                        "found": True,
-                        "sys_id": group.get("sys_id"),
-                        "name": group.get("name"),
-                        "description": group.get("description"),
-                        "active": group.get("active") == "true"
-                    }
+                    return self._format_group(groups[0])
+                else:
+                    return {"found": False}
+            else:
+                return {"found": False, "error": result.get("error")}
+                
+        except Exception as e:
+            logger.error(f"Error looking up group {group_name}: {e}")
+            return {"found": False, "error": str(e)}
+
+    async def alookup_group_by_name(self, group_name: str) -> Dict[str, Any]:
+        """
+        Async variant of lookup_group_by_name
+        
+        Args:
+            group_name: Group name to search for
+            
+        Returns:
+            Dict containing group information
+        """
+        try:
+            params = {
+                "sysparm_query": f"name={group_name}",
+                "sysparm_limit": "1"
+            }
+            
+            result = await self._amake_request("GET", "sys_user_group", params=params)
+            
+            if result.get("success"):
+                groups = result.get("data", {}).get("result", [])
+                if groups:
+                    return self._format_group(groups[0])
                 else:
                     return {"found": False}
             else:
@@ -465,39 +924,35 @@ class ServiceNowAPI:
             if not user_result.get("found"):
                 return {"success": True, "incidents": []}
             
-            user_sys_id = user_result.get("sys_id")
-            
-            # Calculate date range
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days_back)
+            params = self._incident_search_params(user_result.get("sys_id"), days_back)
+            result = self._make_request("GET", "incident", params=params)
+            return self._format_incident_search(result)
+                
+        except Exception as e:
+            logger.error(f"Error searching incidents for {email}: {e}")
+            return {"success": False, "error": str(e)}
+
+    async def asearch_incidents_by_caller_email(self, email: str, days_back: int = 30) -> Dict[str, Any]:
+        """
+        Async variant of search_incidents_by_caller_email
+        
+        Args:
+            email: Caller email address
+            days_back: Number of days to search back
             
-            params = {
-                "sysparm_query": f"caller_id={user_sys_id}^sys_created_on>={start_date.strftime('%Y-%m-%d')}",
-                "sysparm_limit": "100",
-                "sysparm_order": "sys_created_on"
-            }
+        Returns:
+            Dict containing search results
+        """
+        try:
+            # First lookup user by email
+            user_result = await self.alookup_user_by_email(email)
             
-            result = self._make_request("GET", "incident", params=params)
+            if not user_result.get("found"):
+                return {"success": True, "incidents": []}
             
-            if result.get("success"):
-                incidents = result.get("data", {}).get("result", [])
-                formatted_incidents = []
-                
-                for incident in incidents:
-                    formatted_incidents.append({
-                        "sys_id": incident.get("sys_id"),
-                        "number": incident.get("number"),
-                        "short_description": incident.get("short_description"),
-                        "state": incident.get("state"),
-                        "state_name": incident.get("state", {}).get("display_value", ""),
-                        "priority": incident.get("priority"),
-                        "created_on": incident.get("sys_created_on"),
-                        "updated_on": incident.get("sys_updated_on")
-                    })
-                
-                return {"success": True, "incidents": formatted_incidents}
-            else:
-                return {"success": False, "error": result.get("error")}
+            params = self._incident_search_params(user_result.get("sys_id"), days_back)
+            result = await self._amake_request("GET", "incident", params=params)
+            return self._format_incident_search(result)
                 
         except Exception as e:
             logger.error(f"Error searching incidents for {email}: {e}")
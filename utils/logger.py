@@ -2,12 +2,30 @@
 Logger Utility - Centralized logging configuration
 """
 
+import functools
 import logging
 import logging.handlers
 import os
+import queue
 from typing import Optional
 from datetime import datetime
 
+# Shared formatters (formatters are stateless, so one instance serves every handler)
+_DETAILED_FMT = logging.Formatter(
+    fmt='%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+_CONSOLE_FMT = logging.Formatter(
+    fmt='%(asctime)s - %(levelname)s - %(message)s',
+    datefmt='%H:%M:%S'
+)
+
+_APP_CONSOLE_FMT = logging.Formatter(
+    fmt='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+    datefmt='%H:%M:%S'
+)
+
 def setup_logger(name: str, level: str = "INFO", log_file: Optional[str] = None) -> logging.Logger:
     """
     Set up a logger with consistent formatting and handlers
@@ -20,6 +38,11 @@ def setup_logger(name: str, level: str = "INFO", log_file: Optional[str] = None)
     Returns:
         Configured logger instance
     """
+    return _cached_setup_logger(name, level, log_file)
+
+@functools.lru_cache(maxsize=None)
+def _cached_setup_logger(name: str, level: str, log_file: Optional[str]) -> logging.Logger:
+    """Configure a logger once per (name, level, log_file)"""
     # Create logger
     logger = logging.getLogger(name)
     
@@ -31,21 +54,10 @@ def setup_logger(name: str, level: str = "INFO", log_file: Optional[str] = None)
     numeric_level = getattr(logging, level.upper(), logging.INFO)
     logger.setLevel(numeric_level)
     
-    # Create formatters
-    detailed_formatter = logging.Formatter(
-        fmt='%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
-    console_formatter = logging.Formatter(
-        fmt='%(asctime)s - %(levelname)s - %(message)s',
-        datefmt='%H:%M:%S'
-    )
-    
     # Console handler
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(console_formatter)
+    console_handler.setFormatter(_CONSOLE_FMT)
     logger.addHandler(console_handler)
     
     # File handler (if specified)
@@ -64,7 +76,7 @@ def setup_logger(name: str, level: str = "INFO", log_file: Optional[str] = None)
                 encoding='utf-8'
             )
             file_handler.setLevel(logging.DEBUG)
-            file_handler.setFormatter(detailed_formatter)
+            file_handler.setFormatter(_DETAILED_FMT)
             logger.addHandler(file_handler)
             
         except Exception as e:
@@ -72,8 +84,14 @@ def setup_logger(name: str, level: str = "INFO", log_file: Optional[str] = None)
     
     return logger
 
+# Background listener that writes queued records to the log files, and the
+# root-logger handler that feeds it
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+
 def setup_application_logging():
     """Set up application-wide logging configuration"""
+    global _queue_listener, _queue_handler
     
     # Create logs directory
     log_dir = "logs"
@@ -91,23 +109,12 @@ def setup_application_logging():
     
     # Clear any existing handlers
     root_logger.handlers.clear()
-    
-    # Detailed formatter for files
-    detailed_formatter = logging.Formatter(
-        fmt='%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
-    # Console formatter
-    console_formatter = logging.Formatter(
-        fmt='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
-        datefmt='%H:%M:%S'
-    )
+    stop_application_logging()
     
     # Console handler
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(console_formatter)
+    console_handler.setFormatter(_APP_CONSOLE_FMT)
     root_logger.addHandler(console_handler)
     
     # Application log file handler
@@ -118,8 +125,7 @@ def setup_application_logging():
         encoding='utf-8'
     )
     app_file_handler.setLevel(logging.DEBUG)
-    app_file_handler.setFormatter(detailed_formatter)
-    root_logger.addHandler(app_file_handler)
+    app_file_handler.setFormatter(_DETAILED_FMT)
     
     # Error log file handler (errors and critical only)
     error_file_handler = logging.handlers.RotatingFileHandler(
@@ -129,8 +135,34 @@ def setup_application_logging():
         encoding='utf-8'
     )
     error_file_handler.setLevel(logging.ERROR)
-    error_file_handler.setFormatter(detailed_formatter)
-    root_logger.addHandler(error_file_handler)
+    error_file_handler.setFormatter(_DETAILED_FMT)
+    
+    # File writes happen on a listener thread so logging never blocks the event loop
+    log_queue = queue.SimpleQueue()
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    root_logger.addHandler(_queue_handler)
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue,
+        app_file_handler,
+        error_file_handler,
+        respect_handler_level=True
+    )
+    _queue_listener.start()
     
     logger = logging.getLogger(__name__)
-    logger.info("Application logging configured successfully")
\ No newline at end of file
+    logger.info("Application logging configured successfully")
+
+def stop_application_logging():
+    """Flush queued log records, stop the file logging listener and close the log files"""
+    global _queue_listener, _queue_handler
+    
+    # Detach the queue first so later records aren't left in a queue nobody drains
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        for handler in _queue_listener.handlers:
+            handler.close()
+        _queue_listener = None
\ No newline at end of file